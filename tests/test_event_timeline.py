@@ -0,0 +1,21 @@
+__author__ = "Cameron Summers"
+
+import datetime
+
+from tidepool_data_science_simulator.models.simulation import EventTimeline
+from tidepool_data_science_simulator.models.measures import Bolus
+
+
+def test_event_timeline_get_event():
+
+    time = datetime.datetime.fromisoformat("2020-01-01 12:00:00")
+    first_bolus = Bolus(1.0, "U")
+    timeline = EventTimeline(
+        datetimes=[time, time, time + datetime.timedelta(minutes=5)],
+        events=[first_bolus, Bolus(2.0, "U"), Bolus(3.0, "U")],
+    )
+
+    # The first event at a time is returned
+    assert timeline.get_event(time) is first_bolus
+    assert timeline.get_event(time + datetime.timedelta(minutes=5)).value == 3.0
+    assert timeline.get_event(time + datetime.timedelta(minutes=10)) is None
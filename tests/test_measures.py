@@ -1 +1,30 @@
-__author__ = "Cameron Summers"
\ No newline at end of file
+__author__ = "Cameron Summers"
+
+import datetime
+
+from tidepool_data_science_simulator.models.measures import GlucoseTrace
+
+
+def test_glucose_trace_copy():
+
+    t0 = datetime.datetime.fromisoformat("2020-01-01 00:00:00")
+    trace = GlucoseTrace(datetimes=[t0], values=[110])
+
+    trace_copy = trace.copy()
+    trace_copy.append(t0 + datetime.timedelta(minutes=5), 120)
+
+    assert trace.get_last() == (t0, 110)
+    assert trace_copy.get_last() == (t0 + datetime.timedelta(minutes=5), 120)
+
+
+def test_glucose_trace_loop_format():
+
+    t0 = datetime.datetime.fromisoformat("2020-01-01 00:00:00")
+    trace = GlucoseTrace(datetimes=[t0], values=[30.2])
+    trace.append(t0 + datetime.timedelta(minutes=5), 120.6)
+    trace.append(t0 + datetime.timedelta(minutes=10), 450)
+
+    glucose_dates, glucose_values = trace.get_loop_format()
+
+    assert len(glucose_dates) == 3
+    assert glucose_values == [40, 121, 400]
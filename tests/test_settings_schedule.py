@@ -1,6 +1,7 @@
 __author__ = "Cameron Summers"
 
 import datetime
+import pytest
 
 from tidepool_data_science_simulator.models.simulation import SettingSchedule24Hr
 from tidepool_data_science_simulator.models.measures import BasalRate
@@ -53,3 +54,31 @@ def test_basal_rate_retrieval():
     assert basal_schedule.get_state().value == 0.3
 
 
+def test_schedule_gap():
+
+    basal_schedule = SettingSchedule24Hr(
+        time=datetime.datetime.fromisoformat("2020-01-01 00:00:00"),
+        name="Basal",
+        start_times=[datetime.time(hour=0, minute=0, second=0)],
+        values=[BasalRate(0.3, 'U/hr')],
+        duration_minutes=[720],
+    )
+
+    assert basal_schedule.get_state().value == 0.3
+
+    basal_schedule.update(datetime.datetime.fromisoformat("2020-01-01 13:00:00"))
+    with pytest.raises(Exception):
+        basal_schedule.get_state()
+
+
+def test_schedule_length_mismatch():
+
+    # Lengths sum to 3 * len(start_times) but are not equal
+    with pytest.raises(AssertionError):
+        SettingSchedule24Hr(
+            time=datetime.datetime.fromisoformat("2020-01-01 00:00:00"),
+            name="Basal",
+            start_times=[datetime.time(hour=0), datetime.time(hour=12)],
+            values=[BasalRate(0.3, 'U/hr')],
+            duration_minutes=[480, 480, 480],
+        )
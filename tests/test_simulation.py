@@ -0,0 +1,78 @@
+__author__ = "Cameron Summers"
+
+import datetime
+
+from tidepool_data_science_simulator.models.simulation import Simulation
+from tidepool_data_science_simulator.models.measures import (
+    BasalRate,
+    CarbInsulinRatio,
+    InsulinSensitivityFactor,
+)
+
+
+class ConstantPumpState(object):
+    def __init__(self):
+        self.scheduled_basal_rate = BasalRate(0.3, "U/hr")
+        self.temp_basal_rate = None
+
+    def get_temp_basal_rate_value(self, default=None):
+        return default
+
+
+class ConstantPatientState(object):
+    def __init__(self):
+        self.bg = 110.0
+        self.sensor_bg = 110
+        self.iob = 0.0
+        self.pump_state = ConstantPumpState()
+        self.cir = CarbInsulinRatio(10, "g/U")
+        self.isf = InsulinSensitivityFactor(50, "mg/dL/U")
+
+
+class ConstantPatient(object):
+    """
+    Patient whose state never changes, to test the simulation bookkeeping.
+    """
+
+    def init(self):
+        pass
+
+    def predict(self):
+        pass
+
+    def update_from_prediction(self, time):
+        pass
+
+    def update(self, time):
+        pass
+
+    def get_state(self):
+        return ConstantPatientState()
+
+
+class NoActionController(object):
+    def update(self, time, **kwargs):
+        pass
+
+    def get_state(self):
+        return None
+
+
+def test_results_df_indexed_by_time():
+
+    start_time = datetime.datetime.fromisoformat("2020-01-01 00:00:00")
+    simulation = Simulation(
+        time=start_time,
+        duration_hrs=1.0,
+        simulation_config={},
+        virtual_patient=ConstantPatient(),
+        controller=NoActionController(),
+    )
+    simulation.run()
+    results_df = simulation.get_results_df()
+
+    assert results_df.index.name == "time"
+    assert "time" not in results_df.columns
+    assert len(results_df) == 13
+    assert results_df.index[0] == start_time
+    assert results_df.index[-1] == start_time + datetime.timedelta(hours=1)
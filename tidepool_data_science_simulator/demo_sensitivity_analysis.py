@@ -4,13 +4,14 @@ __author__ = "Cameron Summers"
 __author__ = "Cameron Summers"
 
 import os
+import multiprocessing
 import numpy as np
 from collections import defaultdict
 import time
 
 from tidepool_data_science_models.models.simple_metabolism_model import SimpleMetabolismModel
 
-from tidepool_data_science_simulator.models.simulation import Simulation
+from tidepool_data_science_simulator.models.simulation import Simulation, collect_results
 from tidepool_data_science_simulator.models.controller import (
     DoNothingController,
     LoopController,
@@ -126,6 +127,7 @@ def analyze_variance_multiprocess(scenario_csv_filepath, param_grid, plot):
 
     print("Length of param grid: {}".format(len(param_grid)))
 
+    result_queue = multiprocessing.Queue()
     sims = {}
     sim_id_params = {}
     for i, pgrid in enumerate(param_grid):
@@ -154,14 +156,15 @@ def analyze_variance_multiprocess(scenario_csv_filepath, param_grid, plot):
                 virtual_patient=vp,
                 controller=controller,
                 multiprocess=True,
+                result_queue=result_queue,
+                name=sim_id,
             )
 
             sims[sim_id] = simulation
             simulation.start()
             sim_id_params[sim_id] = pgrid
 
-    all_results = {id: sim.queue.get() for id, sim in sims.items()}
-    [sim.join() for id, sim in sims.items()]
+    all_results = collect_results(sims, result_queue)
 
     if plot:
         plot_sim_results(all_results)
@@ -1,13 +1,14 @@
 __author__ = "Cameron Summers"
 
 import os
+import multiprocessing
 import numpy as np
 import matplotlib.pyplot as plt
 
 from tidepool_data_science_models.models.simple_metabolism_model import SimpleMetabolismModel
 from tidepool_data_science_models.models.treatment_models import PalermInsulinModel
 
-from tidepool_data_science_simulator.models.simulation import Simulation
+from tidepool_data_science_simulator.models.simulation import Simulation, collect_results
 from tidepool_data_science_simulator.models.controller import LoopController
 from tidepool_data_science_simulator.models.patient import VirtualPatient, VirtualPatientModel
 from tidepool_data_science_simulator.models.pump import Omnipod
@@ -31,6 +32,8 @@ def analyze_settings(scenario_csv_filepath, param_grid):
     """
     sim_parser = ScenarioParserCSV(scenario_csv_filepath)
 
+    result_queue = multiprocessing.Queue()
+
     # FIXME: Warning, Hack! For near term presentation. Don't do this. Need to refactor parser.
     sims = {}
     for pgrid in param_grid:
@@ -80,12 +83,13 @@ def analyze_settings(scenario_csv_filepath, param_grid):
             virtual_patient=vp,
             controller=controller,
             multiprocess=True,
+            result_queue=result_queue,
+            name=sim_id,
         )
         sims[sim_id] = simulation
         simulation.start()
 
-    all_results = {id: sim.queue.get() for id, sim in sims.items()}
-    [sim.join() for id, sim in sims.items()]
+    all_results = collect_results(sims, result_queue)
 
     plot_sim_results(all_results)
 
@@ -1,8 +1,9 @@
 import os
+import multiprocessing
 
 from tidepool_data_science_models.models.simple_metabolism_model import SimpleMetabolismModel
 
-from tidepool_data_science_simulator.models.simulation import Simulation
+from tidepool_data_science_simulator.models.simulation import Simulation, collect_results
 from tidepool_data_science_simulator.models.controller import DoNothingController, LoopController
 from tidepool_data_science_simulator.models.patient import VirtualPatient
 from tidepool_data_science_simulator.models.pump import Omnipod
@@ -38,7 +39,8 @@ def compare_loop_to_pump_only(scenario_csv_filepath):
         ),
     ]
 
-    all_results = {}
+    result_queue = multiprocessing.Queue()
+    sims = {}
     for controller in controllers:
         sim_id = controller.name
         print("Running: {}".format(sim_id))
@@ -62,12 +64,14 @@ def compare_loop_to_pump_only(scenario_csv_filepath):
             simulation_config=sim_parser.get_simulation_config(),
             virtual_patient=vp,
             controller=controller,
+            multiprocess=True,
+            result_queue=result_queue,
+            name=sim_id,
         )
+        sims[sim_id] = simulation
+        simulation.start()
 
-        simulation.run()
-
-        results_df = simulation.get_results_df()
-        all_results[sim_id] = results_df
+    all_results = collect_results(sims, result_queue)
 
     plot_sim_results(all_results)
 
@@ -1,16 +1,23 @@
 __author__ = "Cameron Summers"
 
-import pickle as pk
 import datetime
 import copy
 import numpy as np
 
 from tidepool_data_science_simulator.models.simulation import SimulationComponent
-from tidepool_data_science_simulator.models.measures import GlucoseTrace
 
 from pyloopkit.loop_data_manager import update
 from pyloopkit.dose import DoseType
 
+# Simulation config keys of the settings schedules, which are static for a simulation
+SCHEDULE_INPUT_PREFIXES = ("basal_rate_", "carb_ratio_", "sensitivity_ratio_", "target_range_")
+
+# Simulation config keys the controller appends temp basals to
+DOSE_INPUT_KEYS = ("dose_types", "dose_values", "dose_start_times", "dose_end_times")
+
+# Duration of the temp basal dose recorded for Loop each step
+TEMP_BASAL_DOSE_DURATION = datetime.timedelta(minutes=5)
+
 
 class DoNothingController(SimulationComponent):
     """
@@ -40,12 +47,19 @@ class LoopController(SimulationComponent):
 
         self.name = "PyLoopkit v0.1"
         self.time = time
-        self.loop_config = copy.deepcopy(loop_config)
+        self.loop_config = dict(loop_config)
         self.recommendations = None
 
         # This is a hack to get this working quickly, it's too coupled to the input file format
         #  Future: Collect the information for the various simulation components
-        self.simulation_config = copy.deepcopy(simulation_config)
+        # Only the dose history is written to by the controller, so that is all that
+        # needs copying. Loop inputs are copied from this in prepare_inputs().
+        self.simulation_config = dict(simulation_config)
+        for key in DOSE_INPUT_KEYS:
+            self.simulation_config[key] = list(simulation_config[key])
+
+        # Snapshot the static inputs now in case the caller edits its config after construction
+        self._static_inputs = self._get_static_inputs()
 
         # The are not used at the moment, but will be once we decouple from simulation config.
         self.model = loop_config["model"]
@@ -78,6 +92,23 @@ class LoopController(SimulationComponent):
         # TODO: make this a class with convenience functions
         return self.recommendations
 
+    def _get_static_inputs(self):
+        """
+        Get the settings schedule entries of the simulation config.
+        These don't change during a simulation so they are copied once and reused
+        for every update.
+
+        Returns
+        -------
+        dict
+            Static entries keyed as in the simulation config
+        """
+        return {
+            key: copy.deepcopy(value)
+            for key, value in self.simulation_config.items()
+            if key.startswith(SCHEDULE_INPUT_PREFIXES)
+        }
+
     def prepare_inputs(self, virtual_patient):
         """
         Collect inputs to the loop update call for the current time.
@@ -95,7 +126,21 @@ class LoopController(SimulationComponent):
 
         """
         glucose_dates, glucose_values = virtual_patient.bg_history.get_loop_format()
-        loop_inputs_dict = copy.deepcopy(self.simulation_config)
+        loop_inputs_dict = {}
+        for key, value in self.simulation_config.items():
+            if key in self._static_inputs:
+                continue
+
+            if isinstance(value, list):
+                # Dose, carb and glucose histories grow every update and hold immutable
+                # values, so copying the list once is enough, no need to copy each element.
+                loop_inputs_dict[key] = list(value)
+            else:
+                loop_inputs_dict[key] = copy.deepcopy(value)
+
+        # Schedules are lists of immutable times and values, so a shallow copy protects the cache from pyloopkit
+        loop_inputs_dict.update({key: copy.copy(value) for key, value in self._static_inputs.items()})
+
         loop_update_dict = {
             "time_to_calculate_at": self.time,
             "glucose_dates": glucose_dates,
@@ -129,7 +174,6 @@ class LoopController(SimulationComponent):
         # other_outputs = pk.load(open(out_fp, "rb"))
 
         loop_algorithm_output = update(loop_inputs_dict)
-        loop_algorithm_output.get("recommended_temp_basal")
 
         # TODO remove once we feel refactor is good
         # assert other_outputs == loop_algorithm_output
@@ -149,10 +193,9 @@ class LoopController(SimulationComponent):
         """
 
         # Update the virtual_patient with any recommendations from loop
-        if loop_algorithm_output.get("recommended_temp_basal") is not None:
-            loop_temp_basal, duration = loop_algorithm_output.get(
-                "recommended_temp_basal"
-            )
+        recommended_temp_basal = loop_algorithm_output.get("recommended_temp_basal")
+        if recommended_temp_basal is not None:
+            loop_temp_basal, duration = recommended_temp_basal
             virtual_patient.pump.set_temp_basal(loop_temp_basal, "U")
             self.simulation_config["dose_values"].append(
                 virtual_patient.pump.active_temp_basal.value
@@ -161,15 +204,13 @@ class LoopController(SimulationComponent):
             # If no recommendations, set a temp basal to the scheduled basal rate
             scheduled_basal_rate = virtual_patient.pump.get_state().scheduled_basal_rate
             virtual_patient.pump.set_temp_basal(scheduled_basal_rate.value, "U")
-            self.simulation_config["dose_values"].append(
-                virtual_patient.pump.get_state().scheduled_basal_rate.value
-            )
+            self.simulation_config["dose_values"].append(scheduled_basal_rate.value)
 
         # Append dose info to simulation config.
         self.simulation_config["dose_types"].append(DoseType.tempbasal)
         self.simulation_config["dose_start_times"].append(self.time)
 
-        next_time = self.time + datetime.timedelta(minutes=5)
+        next_time = self.time + TEMP_BASAL_DOSE_DURATION
         self.simulation_config["dose_end_times"].append(
             next_time
         )  # TODO: is this supposed to be 5 or 30 minutes?
@@ -185,7 +226,7 @@ class LoopControllerDisconnector(LoopController):
         super().__init__(time, loop_config, simulation_config)
 
         self.name = "PyLoopkit v0.1, P(Connect)={}".format(connect_prob)
-        self.original_time = copy.copy(time)
+        self.original_time = time
         self.connect_prob = connect_prob
 
     def is_connected(self):
@@ -196,12 +237,11 @@ class LoopControllerDisconnector(LoopController):
         -------
         bool
         """
-        is_connected = False
-        u = np.random.random()
-        if u < self.connect_prob:
-            is_connected = True
+        # Always connected, no need to draw
+        if self.connect_prob >= 1.0:
+            return True
 
-        return is_connected
+        return np.random.random() < self.connect_prob
 
     def update(self, time, **kwargs):
         """
@@ -221,7 +261,6 @@ class LoopControllerDisconnector(LoopController):
 
             loop_inputs_dict = self.prepare_inputs(virtual_patient)
             loop_algorithm_output = update(loop_inputs_dict)
-            loop_algorithm_output.get("recommended_temp_basal")
 
             self.modulate_temp_basal(virtual_patient, loop_algorithm_output)
             self.recommendations = loop_algorithm_output
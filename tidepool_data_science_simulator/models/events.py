@@ -1,16 +1,53 @@
 __author__ = "Cameron Summers"
 
 import datetime
+from functools import lru_cache
 import numpy as np
 
 from tidepool_data_science_simulator.models.measures import Carb
 from tidepool_data_science_simulator.utils import get_bernoulli_trial_uniform_step_prob
 
 
+@lru_cache(maxsize=None)
+def get_meal_steps_and_prob(time_start, time_end, prob_of_eating):
+    """
+    Get the number of simulation steps in a meal time range and the per step
+    probability of eating that yields prob_of_eating over the range.
+
+    Parameters
+    ----------
+    time_start: datetime.time
+    time_end: datetime.time
+    prob_of_eating: float
+
+    Returns
+    -------
+    (int, float)
+        Number of steps and step probability
+    """
+    # Get number of simulation steps in meal time range
+    datetime_start = datetime.datetime.combine(datetime.date.today(), time_start)
+    datetime_end = datetime.datetime.combine(datetime.date.today(), time_end)
+    datetime_delta = datetime_end - datetime_start
+    datetime_delta_minutes = datetime_delta.total_seconds() / 60
+    num_steps = int(datetime_delta_minutes / 5.0)  # 5 min per step
+
+    # num_steps Bernoulli trials to get prob_of_eating
+    step_prob = get_bernoulli_trial_uniform_step_prob(num_steps, prob_of_eating)
+
+    return num_steps, step_prob
+
+
 class MealModel(object):
     """
     A meal that says if it is time for the meal and probabilistically determines carbs.
     """
+
+    __slots__ = ("name", "time_start", "time_end", "prob_of_eating", "num_steps", "step_prob")
+
+    # Possible carb absorption durations (minutes) for a meal
+    carb_duration_minutes = np.array([3 * 60, 4 * 60, 5 * 60])
+
     def __init__(self, name, time_start, time_end, prob_of_eating):
 
         self.name = name
@@ -18,16 +55,8 @@ class MealModel(object):
         self.time_end = time_end
         self.prob_of_eating = prob_of_eating
 
-        # Get number of simulation steps in meal time range
-        datetime_start = datetime.datetime.combine(datetime.date.today(), time_start)
-        datetime_end = datetime.datetime.combine(datetime.date.today(), time_end)
-        datetime_delta = datetime_end - datetime_start
-        datetime_delta_minutes = datetime_delta.total_seconds() / 60
-        datetime_delta_steps = int(datetime_delta_minutes / 5.0)  # 5 min per step
-        self.num_steps = datetime_delta_steps
-
-        # num_steps Bernoulli trials to get prob_of_eating
-        self.step_prob = get_bernoulli_trial_uniform_step_prob(self.num_steps, prob_of_eating)
+        # Meal models are the same for every virtual patient, so this is cached
+        self.num_steps, self.step_prob = get_meal_steps_and_prob(time_start, time_end, prob_of_eating)
 
     def is_meal_time(self, time):
 
@@ -36,9 +65,9 @@ class MealModel(object):
     def get_carb(self):
 
         carb = Carb(
-            value=np.random.choice(range(20, 40)),
+            value=np.random.randint(20, 40),
             units="g",
-            duration_minutes=np.random.choice([3 * 60, 4 * 60, 5 * 60]),
+            duration_minutes=np.random.choice(self.carb_duration_minutes),
         )
 
         return carb
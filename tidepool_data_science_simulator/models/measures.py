@@ -5,6 +5,7 @@ Classes structures for various types of data used for simulation.
 """
 
 import copy
+import numpy as np
 
 
 class Measure(object):
@@ -12,6 +13,8 @@ class Measure(object):
     Base class for values that have units.
     """
 
+    __slots__ = ("value", "units")
+
     def __init__(self, value, units):
 
         self.value = value
@@ -45,6 +48,8 @@ class BasalRate(Measure):
     A rate of insulin delivered in even pulses over a time period.
     """
 
+    __slots__ = ()
+
     def __init__(self, value, units):
         super().__init__(value, units)
 
@@ -68,6 +73,8 @@ class TempBasal(BasalRate):
     A basal rate that expires after a duration.
     """
 
+    __slots__ = ("start_time", "duration_minutes", "active")
+
     def __init__(self, time, value, duration_minutes, units):
         super().__init__(value, units)
 
@@ -112,6 +119,8 @@ class Bolus(Measure):
     A bolus
     """
 
+    __slots__ = ()
+
     def __init__(self, value, units):
         super().__init__(value, units)
 
@@ -121,6 +130,8 @@ class Carb(Measure):
     A carb with an expected absorption duration.
     """
 
+    __slots__ = ("duration_minutes",)
+
     def __init__(self, value, units, duration_minutes):
         super().__init__(value, units)
 
@@ -184,6 +195,10 @@ class GlucoseTrace(object):
     """
     Basic encapsulation of a trace with associated datetimes.
 
+    Bg values are kept in a preallocated numpy buffer that doubles when full, so
+    appends are amortized O(1). bg_values is a view of the buffer rather than a
+    copy, and is invalidated when the buffer grows.
+
     TODO: Utilize pandas series more here for time operations
     TODO: make bg an BloodGlucose obj instead of int
     """
@@ -194,9 +209,32 @@ class GlucoseTrace(object):
         if datetimes is not None:
             self.datetimes = datetimes
 
-        self.bg_values = []
+        self._bg_values = np.empty(0, dtype=np.float64)
         if values is not None:
-            self.bg_values = values
+            self._bg_values = np.array(values, dtype=np.float64)
+        self._num_values = len(self._bg_values)
+
+    @property
+    def bg_values(self):
+        """
+        The bg values of the trace.
+
+        Returns
+        -------
+        np.array
+        """
+        return self._bg_values[: self._num_values]
+
+    def copy(self):
+        """
+        Get a copy of the trace that can be appended to without changing this one.
+        Datetimes are immutable so only their list is copied.
+
+        Returns
+        -------
+        GlucoseTrace
+        """
+        return GlucoseTrace(datetimes=list(self.datetimes), values=self.bg_values)
 
     def get_last(self):
         """
@@ -223,12 +261,19 @@ class GlucoseTrace(object):
 
         """
 
+        if self._num_values == len(self._bg_values):
+            bg_values = np.empty(max(1, 2 * self._num_values), dtype=np.float64)
+            bg_values[: self._num_values] = self.bg_values
+            self._bg_values = bg_values
+
+        self._bg_values[self._num_values] = bg
+        self._num_values += 1
+
         self.datetimes.append(date)
-        self.bg_values.append(bg)
 
     def get_loop_format(self):
         """
-        Get two numpy arrays for dates and values, used for Loop input
+        Get dates and values, used for Loop input
         """
-        loop_bg_values = [max(40, min(400, round(bg))) for bg in self.bg_values]
+        loop_bg_values = np.clip(np.round(self.bg_values), 40, 400).astype(int).tolist()
         return self.datetimes, loop_bg_values
@@ -17,6 +17,18 @@ class VirtualPatientState(object):
     A class of instantaneous patient information.
     """
 
+    __slots__ = (
+        "bg",
+        "sensor_bg",
+        "bg_prediction",
+        "sensor_bg_prediction",
+        "iob",
+        "iob_prediction",
+        "pump_state",
+        "isf",
+        "cir",
+    )
+
     def __init__(
         self,
         bg,
@@ -67,7 +79,9 @@ class VirtualPatient(SimulationComponent):
         self.sensor = sensor
         self.metabolism_model = metabolism_model
 
-        self.patient_config = copy.deepcopy(patient_config)
+        # Only the glucose history is written to by the patient, so that is all that needs copying
+        self.patient_config = copy.copy(patient_config)
+        self.patient_config.glucose_history = patient_config.glucose_history.copy()
 
         self.bg_history = self.patient_config.glucose_history
         self.iob_history = []  # TODO: make trace obj, not list
@@ -42,6 +42,8 @@ class PumpState(object):
     A class to house the state information for a pump
     """
 
+    __slots__ = ("scheduled_basal_rate", "temp_basal_rate")
+
     def __init__(self, scheduled_basal_rate, temp_basal_rate):
 
         self.scheduled_basal_rate = scheduled_basal_rate
@@ -32,20 +32,21 @@ class NoisySensor(Sensor):
     def __init__(self, sensor_config):
         self.name = "iCGM"
         self.sensor_config = sensor_config
+        self.std_dev = getattr(sensor_config, "std_dev", 5.0)
 
     def get_bg(self, true_bg):
         """
         Get icgm_bg according to internal params
         """
         # Noisy placeholder
-        return int(np.random.normal(true_bg, 5.0))
+        return int(np.random.normal(true_bg, self.std_dev))
 
     def get_bg_trace(self, true_bg_trace):
-        icgm_trace = []
-        for tbg in true_bg_trace:
-            icgm_bg = self.get_bg(tbg)
-            icgm_trace.append(icgm_bg)
-        return icgm_trace
+        """
+        Get icgm_bg for each true bg in the trace with one vectorized np.random.normal call.
+        """
+        true_bg_trace = np.asarray(true_bg_trace, dtype=np.float64)
+        return np.random.normal(true_bg_trace, self.std_dev).astype(np.int64)
 
     def update(self, time):
         # No state
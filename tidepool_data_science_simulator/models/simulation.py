@@ -5,10 +5,30 @@ Classes for simulation specific code.
 """
 
 import multiprocessing
-import copy
 import datetime
+import math
+from bisect import bisect_right
+import numpy as np
 import pandas as pd
 
+# Length of a simulation step
+SIMULATION_STEP = datetime.timedelta(minutes=5)
+
+
+def get_seconds_of_day(time):
+    """
+    Get the seconds passed in the day for a datetime or datetime.time
+
+    Parameters
+    ----------
+    time: datetime or datetime.time
+
+    Returns
+    -------
+    int
+    """
+    return time.hour * 3600 + time.minute * 60 + time.second
+
 
 class SimulationComponent(object):
     """
@@ -67,27 +87,61 @@ class Simulation(multiprocessing.Process):
         virtual_patient,
         controller,
         multiprocess=False,
+        result_queue=None,
+        name=None,
     ):
 
         # To enable multiprocessing
-        super().__init__()
-        self.queue = multiprocessing.Queue()
+        super().__init__(name=name)
         self.multiprocess = multiprocess
 
+        # When run as a process, (name, results dataframe) is put on result_queue if given
+        # so simulations can share one, otherwise the results dataframe is put on queue.
+        self.result_queue = result_queue
+        self._queue = None
+        if self.multiprocess and self.result_queue is None:
+            self._queue = multiprocessing.Queue()
+
         self.simulation_config = simulation_config
 
-        self.start_time = copy.deepcopy(time)
+        self.start_time = time
         self.time = time
 
         self.duration_hrs = duration_hrs
+
+        # Steps are counted so finishing doesn't need datetime math each step
+        self.num_steps = math.ceil(duration_hrs * 12)
+        self.step_count = 0
+
         self.virtual_patient = virtual_patient
         self.controller = controller
 
-        self.simulation_results = dict()
+        # (time, patient state, controller state) for each step, in time order
+        self.simulation_results = []
+
+        # Results are also kept column-wise for building the results dataframe,
+        # preallocated for the states at t=0 and each 5 minute step.
+        self._num_results = 0
+        self._allocate_results(self.num_steps + 1)
 
         # Get things setup for t=0
         self.init()
 
+    @property
+    def queue(self):
+        """
+        Get the queue for the results dataframe of this simulation. It is only
+        created on access if the simulation isn't run as a process.
+
+        Returns
+        -------
+        multiprocessing.Queue
+        """
+        if self._queue is None:
+            self._queue = multiprocessing.Queue()
+
+        return self._queue
+
     def init(self):
         """
         Initialize the simulation
@@ -127,9 +181,10 @@ class Simulation(multiprocessing.Process):
         """
         Move the simulation time forward one step, which is 5 minutes.
         """
-        next_time = self.time + datetime.timedelta(minutes=5)
+        next_time = self.time + SIMULATION_STEP
 
         self.time = next_time
+        self.step_count += 1
         self.update(next_time)
 
     def run(self):
@@ -141,18 +196,68 @@ class Simulation(multiprocessing.Process):
             self.store_state()
 
         if self.multiprocess:
-            self.queue.put(self.get_results_df())
+            if self.result_queue is not None:
+                self.result_queue.put((self.name, self.get_results_df()))
+            else:
+                self.queue.put(self.get_results_df())
 
         return self.simulation_results
 
+    def _allocate_results(self, num_results):
+        """
+        Allocate the results columns to hold num_results states.
+
+        Parameters
+        ----------
+        num_results: int
+        """
+        self._result_times = [None] * num_results
+        self._result_columns = {
+            "bg": np.full(num_results, np.nan),
+            "bg_sensor": np.full(num_results, np.nan),
+            "iob": np.full(num_results, np.nan),
+            "temp_basal": np.full(num_results, np.nan),
+            "temp_basal_zeros": np.full(num_results, np.nan),
+            "sbr": np.full(num_results, np.nan),
+            "cir": np.empty(num_results, dtype=object),
+            "isf": np.empty(num_results, dtype=object),
+        }
+
     def store_state(self):
         """
         Store the current state of the simulation in the results.
         """
-        self.simulation_results[self.time] = SimulationState(
-            patient_state=self.virtual_patient.get_state(),
-            controller_state=self.controller.get_state(),
-        )
+        patient_state = self.virtual_patient.get_state()
+
+        self.simulation_results.append((self.time, patient_state, self.controller.get_state()))
+
+        i = self._num_results
+        pump_state = patient_state.pump_state
+        self._result_times[i] = self.time
+        self._result_columns["bg"][i] = patient_state.bg
+        self._result_columns["bg_sensor"][i] = patient_state.sensor_bg
+        self._result_columns["iob"][i] = patient_state.iob
+        self._result_columns["temp_basal"][i] = pump_state.get_temp_basal_rate_value(default=np.nan)
+        self._result_columns["temp_basal_zeros"][i] = pump_state.get_temp_basal_rate_value(default=0)
+        self._result_columns["sbr"][i] = pump_state.scheduled_basal_rate.value
+        self._result_columns["cir"][i] = patient_state.cir
+        self._result_columns["isf"][i] = patient_state.isf
+        self._num_results += 1
+
+    @property
+    def simulation_results_by_time(self):
+        """
+        Get the simulation states keyed by time.
+
+        Returns
+        -------
+        dict
+            SimulationState for each time step
+        """
+        return {
+            time: SimulationState(patient_state=patient_state, controller_state=controller_state)
+            for time, patient_state, controller_state in self.simulation_results
+        }
 
     def is_finished(self):
         """
@@ -164,10 +269,7 @@ class Simulation(multiprocessing.Process):
             True if the simulation has passed the specified length
         """
 
-        seconds_passed = (self.time - self.start_time).total_seconds()
-        hours_frac_passed = seconds_passed / 3600.0
-
-        return hours_frac_passed >= self.duration_hrs
+        return self.step_count >= self.num_steps
 
     def get_results_df(self):
         """
@@ -179,28 +281,37 @@ class Simulation(multiprocessing.Process):
             The time series result of the simulation
         """
 
-        data = [
-            {
-                "time": time,
-                "bg": simulation_state.patient_state.bg,
-                "bg_sensor": simulation_state.patient_state.sensor_bg,
-                "iob": simulation_state.patient_state.iob,
-                "temp_basal": simulation_state.patient_state.pump_state.get_temp_basal_rate_value(
-                    default=None
-                ),
-                "temp_basal_zeros": simulation_state.patient_state.pump_state.get_temp_basal_rate_value(
-                    default=0
-                ),
-                "sbr": simulation_state.patient_state.pump_state.scheduled_basal_rate.value,
-                "cir": simulation_state.patient_state.cir,
-                "isf": simulation_state.patient_state.isf,
-            }
-            for time, simulation_state in self.simulation_results.items()
-        ]
-
-        df = pd.DataFrame(data)
-        df.set_index("time")
-        return df
+        data = {name: column[: self._num_results] for name, column in self._result_columns.items()}
+        times = pd.DatetimeIndex(self._result_times[: self._num_results], name="time")
+
+        return pd.DataFrame(data, index=times)
+
+
+def collect_results(sims, result_queue):
+    """
+    Get the results of simulations started as processes that share a result queue,
+    then join the processes.
+
+    Parameters
+    ----------
+    sims: dict
+        Started Simulation for each sim id, with the sim id as its name
+    result_queue: multiprocessing.Queue
+        Queue shared by the simulations
+
+    Returns
+    -------
+    dict
+        Results dataframe for each sim id, in the order of sims
+    """
+    # Results arrive in order of completion
+    results = dict(result_queue.get() for _ in sims)
+    all_results = {sim_id: results[sim_id] for sim_id in sims}
+
+    for sim in sims.values():
+        sim.join()
+
+    return all_results
 
 
 class SettingSchedule24Hr(SimulationComponent):
@@ -231,11 +342,11 @@ class SettingSchedule24Hr(SimulationComponent):
         self.time = time
         self.name = name
 
+        # Updated with time so get_state() calls between updates don't recompute it
+        self._seconds_of_day = get_seconds_of_day(time)
+
         # All the same length
-        assert (
-            len(start_times) + len(values) + len(duration_minutes)
-            == len(start_times) * 3
-        )
+        assert len(start_times) == len(values) == len(duration_minutes)
 
         self.schedule = {}
         for start_time, value, duration_minutes in zip(
@@ -253,6 +364,21 @@ class SettingSchedule24Hr(SimulationComponent):
             end_time = end_datetime.time()
             self.schedule[(start_time, end_time)] = value
 
+        # Segments sorted by start for bisecting the current time in get_state()
+        segments = sorted(
+            [
+                (get_seconds_of_day(start_time), get_seconds_of_day(end_time), value)
+                for (start_time, end_time), value in self.schedule.items()
+            ],
+            key=lambda segment: segment[0],
+        )
+        self._start_seconds = [start_seconds for start_seconds, _, _ in segments]
+        self._end_seconds = [end_seconds for _, end_seconds, _ in segments]
+        self._values = [value for _, _, value in segments]
+
+        # Resolved values by seconds of day, the same times recur every simulated day
+        self._values_by_seconds = {}
+
     def get_state(self):
         """
         Get the value object at the current time, e.g. carb ratio or target range
@@ -263,10 +389,16 @@ class SettingSchedule24Hr(SimulationComponent):
             The object at the current time
         """
 
-        for (start_time, end_time), value in self.schedule.items():
-            current_time = self.time.time()
-            if start_time <= current_time <= end_time:
-                return value
+        current_seconds = self._seconds_of_day
+        value = self._values_by_seconds.get(current_seconds)
+        if value is not None:
+            return value
+
+        i = bisect_right(self._start_seconds, current_seconds) - 1
+        if i >= 0 and current_seconds <= self._end_seconds[i]:
+            value = self._values[i]
+            self._values_by_seconds[current_seconds] = value
+            return value
 
         raise Exception("Could not find setting for time {}".format(self.time))
 
@@ -288,6 +420,7 @@ class SettingSchedule24Hr(SimulationComponent):
         """
 
         self.time = time
+        self._seconds_of_day = get_seconds_of_day(time)
 
 
 class EventTimeline(object):
@@ -299,6 +432,11 @@ class EventTimeline(object):
 
         self.events = pd.DataFrame({"date": datetimes, "event": events})
 
+        # Events by time for lookups in get_event(), keeping the first event at a time
+        self._events_by_time = {}
+        for date, event in zip(datetimes, events):
+            self._events_by_time.setdefault(date, event)
+
     def get_event(self, time):
         """
         Get the event at the given time. If no event, returns None
@@ -313,10 +451,4 @@ class EventTimeline(object):
         object
             The insulin/carb/etc. event or None
         """
-        event = None
-
-        event_mask = self.events["date"] == time
-        if event_mask.any():
-            event = self.events[event_mask]["event"].values[0]
-
-        return event
+        return self._events_by_time.get(time)
@@ -1,9 +1,11 @@
 __author__ = "Cameron Summers"
 
 import time
+from functools import lru_cache
 import numpy as np
 
 
+@lru_cache(maxsize=256)
 def get_bernoulli_trial_uniform_step_prob(num_trials, prob_of_occurring):
     """
     Given an event has a probability P of happening in a set number of trials,
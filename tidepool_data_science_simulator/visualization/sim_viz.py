@@ -1,47 +1,100 @@
 __author__ = "Cameron Summers"
 
 import numpy as np
+import pandas as pd
 
 import matplotlib.pyplot as plt
 import matplotlib.style as style
 
-style.use("seaborn-poster")  # sets the size of the charts
-style.use("ggplot")
+_style_applied = False
+
+
+def apply_plot_style():
+    """
+    Set the plot style, once. Done at plot time rather than import so processes that
+    never plot, e.g. multiprocess simulations, don't load the style sheets.
+    """
+    global _style_applied
+
+    if not _style_applied:
+        style.use("seaborn-poster")  # sets the size of the charts
+        style.use("ggplot")
+        _style_applied = True
+
+
+def get_column_df(all_results, column):
+    """
+    Get a results column of every simulation as one dataframe.
+
+    Parameters
+    ----------
+    all_results: dict
+        Results dataframe for each sim id
+    column: str
+        Results column
+
+    Returns
+    -------
+    pd.DataFrame
+        The column for each sim id
+    """
+    return pd.concat({sim_id: df[column] for sim_id, df in all_results.items()}, axis=1)
+
+
+def plot_columns(ax, column_df, label_prefix):
+    """
+    Plot a results column of every simulation with a single plot call.
+
+    Parameters
+    ----------
+    ax: matplotlib.axes.Axes
+    column_df: pd.DataFrame
+        The column for each sim id, see get_column_df()
+    label_prefix: str
+        Prefix for the legend label of each simulation
+    """
+    lines = ax.plot(column_df.index, column_df.to_numpy())
+    for line, sim_id in zip(lines, column_df.columns):
+        line.set_label("{} {}".format(label_prefix, sim_id))
 
 
 def plot_sim_results(all_results):
 
+    apply_plot_style()
+
     # ==== TMP ====
     # TODO - This is a placeholder for dev. Replace with viz tools module.
     fig, ax = plt.subplots(2, 1, figsize=(16, 20))
-    for sim_id, ctrl_result_df in all_results.items():
-
-        ax[0].plot(ctrl_result_df["bg"], label="{} {}".format("bg", sim_id))
-        ax[0].set_title("BG Over Time")
-        ax[0].set_xlabel("Time (5min)")
-        ax[0].set_ylabel("BG (mg/dL)")
-        ax[0].set_ylim((0, 400))
-        ax[0].legend()
-
-        ax[1].plot(ctrl_result_df["sbr"], label="{} {}".format("sbr", sim_id))
-        ax[1].set_title("Schedule Basal Rate Over Time")
-        ax[1].set_ylabel("Insulin (U)")
-        ax[1].set_xlabel("Time (5 mins)")
-        ax[1].plot(ctrl_result_df["temp_basal"], label="{} {}".format("tmp_br", sim_id))
-        ax[1].set_title("Temp Basal Rate")
-        ax[1].legend()
-        ax[1].legend()
-
-        print(
-            "Patient Bg min {} max {}".format(
-                ctrl_result_df["bg"].min(), ctrl_result_df["bg"].max()
-            )
-        )
-
-        log_bg = np.log(ctrl_result_df["bg"])
-        geo_mean = np.mean(log_bg)
-        geo_var = np.var(log_bg)
 
+    bg_df = get_column_df(all_results, "bg")
+    plot_columns(ax[0], bg_df, "bg")
+    ax[0].set_title("BG Over Time")
+    ax[0].set_xlabel("Time")
+    ax[0].set_ylabel("BG (mg/dL)")
+    ax[0].set_ylim((0, 400))
+    ax[0].legend()
+
+    plot_columns(ax[1], get_column_df(all_results, "sbr"), "sbr")
+    plot_columns(ax[1], get_column_df(all_results, "temp_basal"), "tmp_br")
+    ax[1].set_title("Temp Basal Rate")
+    ax[1].set_ylabel("Insulin (U)")
+    ax[1].set_xlabel("Time")
+    ax[1].legend()
+
+    # Stats for all the sims at once
+    bg_stats = bg_df.agg(["min", "max"])
+    log_bg_df = np.log(bg_df)
+    geo_means = log_bg_df.mean()
+    geo_vars = log_bg_df.var(ddof=0)
+
+    for sim_id in all_results.keys():
+
+        print("Patient Bg min {} max {}".format(bg_stats.loc["min", sim_id], bg_stats.loc["max", sim_id]))
+
+        geo_mean = geo_means[sim_id]
+        geo_var = geo_vars[sim_id]
+
+        # log_bg = log_bg_df[sim_id]
         # counts, bins, patches = ax[2].hist(log_bg, bins=50, label="{} {} {}".format("bg", vp_name, ctr_name), alpha=0.1)
         # # ax[2].set_xscale("log")
         # ax[2].set_xticklabels(np.exp(bins).astype(int))